@@ -1,20 +1,79 @@
 # FILE: app.py
 # Main Flask application with Knowledge Graph API integration
 
-import secrets
+import hashlib
+import json
 import os
-from flask import Flask, render_template, session, redirect, url_for, g, request, jsonify
+import orjson
+from flask import Flask, render_template, session, redirect, url_for, request, jsonify, Response, make_response
+from flask.json.provider import DefaultJSONProvider
 from auth import auth_bp
 from dotenv import load_dotenv
 import logging
 from datetime import datetime
+from functools import lru_cache
 
 load_dotenv()
 
+# Knowledge Graph support is optional - resolve the handler once at import instead of per request
+try:
+    from kg_api_handler import KnowledgeGraphAPI
+    KG_AVAILABLE = True
+except ImportError:
+    KnowledgeGraphAPI = None
+    KG_AVAILABLE = False
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson - serializes straight to UTF-8 bytes for jsonify responses"""
+
+    def _options(self):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return option
+
+    def dumps(self, obj, **kwargs):
+        # Sessions and |tojson always get compact output; json.dumps options orjson can't honour
+        # (indent, separators, ...) go to the stdlib provider
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._options()).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        option = self._options() | orjson.OPT_APPEND_NEWLINE
+        # Pretty-print jsonify responses in debug mode, like Flask's default provider
+        if self.compact is False or (self.compact is None and self._app.debug):
+            option |= orjson.OPT_INDENT_2
+        body = orjson.dumps(obj, default=self.default, option=option)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.secret_key = os.environ.get("SECRET_KEY", "fallback-unsafe-dev-key")
 app.register_blueprint(auth_bp)
 
+# Server-side sessions: with REDIS_URL set (e.g. unix:///var/run/redis/redis.sock), session data
+# lives in Redis and the cookie only carries the session id, so counter updates don't re-sign
+# and re-send the whole session on every response. Without it Flask's signed cookie is used.
+REDIS_URL = os.environ.get("REDIS_URL", "")
+usage_redis = None
+if REDIS_URL:
+    import redis
+    from flask_session import Session
+
+    app.config.update(
+        SESSION_TYPE="redis",
+        SESSION_REDIS=redis.Redis.from_url(REDIS_URL),
+        SESSION_PERMANENT=False,
+    )
+    Session(app)
+    # Usage counters are kept as plain Redis integers next to the session (see add_usage)
+    usage_redis = app.config["SESSION_REDIS"]
+
 # Set up logging
 DEBUG_MODE = os.environ.get("DEBUG", "False").lower() == "true"
 
@@ -27,49 +86,103 @@ else:
     logging.basicConfig(level=logging.WARNING)
     logger = logging.getLogger(__name__)
 
-@app.before_request
-def set_csp_nonce():
-    # nonce is useful if you later add a tiny inline script you explicitly want to allow
-    g.csp_nonce = secrets.token_urlsafe(16)
+# The API key is fixed for the life of the process, so routes and template globals read it once here
+GOOGLE_MAPS_API_KEY = os.environ.get("GOOGLE_MAPS_API_KEY", "")
+KG_ENABLED = KG_AVAILABLE and bool(GOOGLE_MAPS_API_KEY)
+
+# Frontend config script, built once - served from /config.js so pages carry no inline script
+# and the CSP below needs no per-request nonce
+_CONFIG_JS = (
+    f"window.GOOGLE_MAPS_API_KEY = {json.dumps(GOOGLE_MAPS_API_KEY)};\n"
+    f"window.googleMapsApiKey = {json.dumps(GOOGLE_MAPS_API_KEY)};\n"
+    f"window.DEBUG_MODE = {json.dumps(DEBUG_MODE)};\n"
+)
+
+# Static CSP header, built once at import
+# More permissive CSP for Google Maps - allows inline scripts with specific hashes
+_STATIC_CSP = (
+    "default-src 'self'; "
+    "script-src 'self' 'unsafe-eval' 'unsafe-inline' "
+    "'sha256-lA6DFZV6V7GN5UYD5Y6H7epxXzehHxeXQjoJVsIfqxI=' "
+    "'sha256-7AcVsEOyOE8yFFMDWrYQoomjBEFOMdd7BAy3FH3i5nc=' "
+    "https://maps.googleapis.com https://maps.gstatic.com https://cdn.jsdelivr.net; "
+    "style-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net https://fonts.googleapis.com; "
+    "img-src 'self' data: https://*.googleapis.com https://*.gstatic.com https://*.google.com; "
+    "connect-src 'self' https://*.googleapis.com; "
+    "font-src 'self' https://cdn.jsdelivr.net https://fonts.gstatic.com; "
+    "object-src 'none'; base-uri 'self'; frame-ancestors 'self';"
+)
+
+_now = datetime.now
+
+def _now_iso():
+    """Current time as an ISO 8601 string - the single place session timestamps are produced"""
+    return _now().isoformat()
+
+# API usage counters, in the order add_usage takes its deltas
+USAGE_FIELDS = ("api_usage_today", "places_api_calls", "kg_api_calls")
+
+def _usage_keys():
+    return [f"usage:{session.sid}:{field}" for field in USAGE_FIELDS]
+
+def add_usage(total=0, places=0, kg=0):
+    """
+    Add to the usage counters and return their new values. With Redis each counter is an
+    atomic INCRBY, so parallel requests from one user can't lose updates and the session
+    blob is never rewritten; otherwise the counters live in the session itself.
+    """
+    deltas = (total, places, kg)
+    if usage_redis is not None:
+        pipe = usage_redis.pipeline()
+        for key, delta in zip(_usage_keys(), deltas):
+            pipe.incrby(key, delta)
+            pipe.expire(key, app.permanent_session_lifetime)
+        return dict(zip(USAGE_FIELDS, pipe.execute()[::2]))
+    usage = {field: session.get(field, 0) + delta for field, delta in zip(USAGE_FIELDS, deltas)}
+    session.update(usage)
+    return usage
+
+def get_usage():
+    """Read all usage counters in one round trip"""
+    if usage_redis is not None:
+        return dict(zip(USAGE_FIELDS, (int(value or 0) for value in usage_redis.mget(_usage_keys()))))
+    return {field: session.get(field, 0) for field in USAGE_FIELDS}
+
+# Responses a browser can run scripts in - SVG and XHTML are documents too
+CSP_MIMETYPES = frozenset({"text/html", "application/xhtml+xml", "image/svg+xml"})
 
 @app.after_request
 def apply_csp(response):
-    csp_nonce = getattr(g, "csp_nonce", "")
-    # More permissive CSP for Google Maps - allows inline scripts with specific hashes
-    csp = (
-        f"default-src 'self'; "
-        f"script-src 'self' 'unsafe-eval' 'unsafe-inline' 'nonce-{csp_nonce}' "
-        f"'sha256-lA6DFZV6V7GN5UYD5Y6H7epxXzehHxeXQjoJVsIfqxI=' "
-        f"'sha256-7AcVsEOyOE8yFFMDWrYQoomjBEFOMdd7BAy3FH3i5nc=' "
-        f"https://maps.googleapis.com https://maps.gstatic.com https://cdn.jsdelivr.net; "
-        f"style-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net https://fonts.googleapis.com; "
-        f"img-src 'self' data: https://*.googleapis.com https://*.gstatic.com https://*.google.com; "
-        f"connect-src 'self' https://*.googleapis.com; "
-        f"font-src 'self' https://cdn.jsdelivr.net https://fonts.gstatic.com; "
-        f"object-src 'none'; base-uri 'self'; frame-ancestors 'self';"
-    )
-    response.headers["Content-Security-Policy"] = csp
+    # CSP only governs documents - JSON, config.js, CSS, raster images and 304s don't need the header
+    if request.path.startswith("/api/") or response.mimetype not in CSP_MIMETYPES:
+        return response
+    response.headers["Content-Security-Policy"] = _STATIC_CSP
     return response
 
+# Largest batch accepted by /api/knowledge-graph/batch - the handler fans it out over its thread pool
+KG_BATCH_MAX_SIZE = 50
+
+@lru_cache(maxsize=1)
+def get_kg_api():
+    """Return the process-wide KnowledgeGraphAPI so its requests.Session keeps TLS connections alive"""
+    return KnowledgeGraphAPI(GOOGLE_MAPS_API_KEY)
+
+# Every template global is a process constant, so the context dict is built once and reused
+_TEMPLATE_GLOBALS = {
+    "debug_mode": DEBUG_MODE,
+    "google_maps_api_key": GOOGLE_MAPS_API_KEY,
+    "knowledge_graph_enabled": KG_ENABLED
+}
+
 @app.context_processor
 def inject_template_globals():
     """Inject all template globals in one place"""
-    api_key = os.environ.get("GOOGLE_MAPS_API_KEY", "")
-    
-    # Check KG availability
-    kg_enabled = False
-    try:
-        from kg_api_handler import KnowledgeGraphAPI
-        kg_enabled = bool(api_key)
-    except ImportError:
-        kg_enabled = False
-    
-    return {
-        "debug_mode": DEBUG_MODE,
-        "csp_nonce": getattr(g, "csp_nonce", ""),
-        "google_maps_api_key": api_key,
-        "knowledge_graph_enabled": kg_enabled
-    }
+    return _TEMPLATE_GLOBALS
+
+@app.route("/config.js")
+def config_js():
+    """Expose the Maps API key and debug flag to frontend JavaScript"""
+    return Response(_CONFIG_JS, mimetype="application/javascript")
 
 @app.route("/login-info")
 def login_info():
@@ -84,13 +197,30 @@ def home():
         return redirect(url_for("login_info"))
     return render_template("search.html")
 
+# Pages whose HTML depends on nothing per-request can be cached by browsers and a reverse proxy
+STATIC_PAGE_CACHE_CONTROL = "public, max-age=3600"
+
+@lru_cache(maxsize=None)
+def _render_static_page(template):
+    # Template globals are process constants, so the rendered HTML is too
+    return render_template(template)
+
+def static_page(template):
+    # With template auto-reload on (debug or TEMPLATES_AUTO_RELOAD), render every time so edits show up
+    if app.debug or app.config.get("TEMPLATES_AUTO_RELOAD"):
+        response = make_response(render_template(template))
+    else:
+        response = make_response(_render_static_page(template))
+    response.headers["Cache-Control"] = STATIC_PAGE_CACHE_CONTROL
+    return response
+
 @app.route("/history")
 def history():
-    return render_template("history.html")
+    return static_page("history.html")
 
 @app.route("/help")
 def help_page():
-    return render_template("help.html")
+    return static_page("help.html")
 
 # Knowledge Graph API Routes
 @app.route("/api/knowledge-graph", methods=["POST"])
@@ -109,11 +239,16 @@ def fetch_knowledge_graph_data():
     if not session.get("logged_in"):
         return jsonify({"error": "Authentication required"}), 401
     
+    if not KG_AVAILABLE:
+        logger.error("kg_api_handler module not found")
+        return jsonify({
+            "success": False,
+            "error": "MODULE_ERROR",
+            "message": "Knowledge Graph handler not available. Please ensure kg_api_handler.py exists."
+        }), 500
+    
     try:
-        # Import here to avoid import error if file doesn't exist yet
-        from kg_api_handler import KnowledgeGraphAPI
-        
-        data = request.get_json()
+        data = request.get_json(silent=True) or {}
         if not data:
             return jsonify({"error": "JSON payload required"}), 400
         
@@ -127,17 +262,16 @@ def fetch_knowledge_graph_data():
         
         # Initialize Knowledge Graph API using the same API key as Maps
         try:
-            api_key = os.environ.get("GOOGLE_MAPS_API_KEY")
-            if not api_key:
+            if not GOOGLE_MAPS_API_KEY:
                 return jsonify({
                     "success": False,
                     "error": "API_CONFIG_ERROR",
                     "message": "Google Maps API key not configured"
                 }), 500
                 
-            kg_api = KnowledgeGraphAPI(api_key)
+            kg_api = get_kg_api()
         except ValueError as e:
-            logger.error(f"Knowledge Graph API initialization failed: {e}")
+            logger.error("Knowledge Graph API initialization failed: %s", e)
             return jsonify({
                 "success": False,
                 "error": "API_CONFIG_ERROR",
@@ -145,12 +279,11 @@ def fetch_knowledge_graph_data():
             }), 500
         
         # Search for the business entity with KG ID if available
-        result = kg_api.find_business_entity(business_name, location, kgmid_from_url)
+        result = kg_api.find_business_entity(business_name, location, kgmid_from_url, place_id)
         
-        # Track API usage in session
-        if result.get('success') and result.get('entity'):
-            session['api_usage_today'] = session.get('api_usage_today', 0) + 1
-            session['kg_api_calls'] = session.get('kg_api_calls', 0) + 1
+        # Track API usage - cached results cost no API calls
+        if result.get('success') and result.get('entity') and not result.get('cached'):
+            add_usage(total=1, kg=1)
         
         # Add additional metadata
         result["request_data"] = {
@@ -161,22 +294,101 @@ def fetch_knowledge_graph_data():
         }
         
         # Log the request for debugging
-        if DEBUG_MODE:
-            logger.debug(f"Knowledge Graph lookup for '{business_name}' - Success: {result['success']}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Knowledge Graph lookup for '%s' - Success: %s", business_name, result['success'])
             if kgmid_from_url:
-                logger.debug(f"Used KG ID from URL: {kgmid_from_url}")
+                logger.debug("Used KG ID from URL: %s", kgmid_from_url)
         
         return jsonify(result)
         
-    except ImportError:
+    except Exception as e:
+        logger.error("Knowledge Graph API route error: %s", e)
+        return jsonify({
+            "success": False,
+            "error": "INTERNAL_ERROR",
+            "message": "Internal server error occurred"
+        }), 500
+
+@app.route("/api/knowledge-graph/batch", methods=["POST"])
+def fetch_knowledge_graph_batch():
+    """
+    Fetch Knowledge Graph data for several business entities concurrently
+    
+    Expected JSON payload:
+    {
+        "businesses": [
+            {"name": "Kenny Bunch Plumbing", "location": "Wylie, TX" (optional),
+             "kgmid_from_url": "/g/11bzt6slj6" (optional), "place_id": "ChIJZU_6qw4ETIYRuXC6ixLcbOk" (optional)},
+            ...
+        ]
+    }
+    """
+    if not session.get("logged_in"):
+        return jsonify({"error": "Authentication required"}), 401
+    
+    if not KG_AVAILABLE:
         logger.error("kg_api_handler module not found")
         return jsonify({
             "success": False,
             "error": "MODULE_ERROR",
             "message": "Knowledge Graph handler not available. Please ensure kg_api_handler.py exists."
         }), 500
+    
+    try:
+        data = request.get_json(silent=True) or {}
+        if not data:
+            return jsonify({"error": "JSON payload required"}), 400
+        
+        businesses = data.get("businesses")
+        if not isinstance(businesses, list) or not businesses:
+            return jsonify({"error": "businesses list is required"}), 400
+        if len(businesses) > KG_BATCH_MAX_SIZE:
+            return jsonify({"error": f"At most {KG_BATCH_MAX_SIZE} businesses per batch"}), 400
+        if not all(isinstance(b, dict) and b.get("name") for b in businesses):
+            return jsonify({"error": "Each business requires a name"}), 400
+        
+        try:
+            if not GOOGLE_MAPS_API_KEY:
+                return jsonify({
+                    "success": False,
+                    "error": "API_CONFIG_ERROR",
+                    "message": "Google Maps API key not configured"
+                }), 500
+                
+            kg_api = get_kg_api()
+        except ValueError as e:
+            logger.error("Knowledge Graph API initialization failed: %s", e)
+            return jsonify({
+                "success": False,
+                "error": "API_CONFIG_ERROR",
+                "message": str(e)
+            }), 500
+        
+        results = kg_api.find_business_entities_batch([
+            (
+                business["name"],
+                business.get("location", ""),
+                business.get("kgmid_from_url"),
+                business.get("place_id")
+            )
+            for business in businesses
+        ])
+        
+        # Track API usage - cached results cost no API calls
+        found = sum(1 for result in results if result.get("success") and result.get("entity"))
+        billed = sum(1 for result in results if result.get("success") and result.get("entity") and not result.get("cached"))
+        if billed:
+            add_usage(total=billed, kg=billed)
+        
+        return jsonify({
+            "success": True,
+            "total": len(results),
+            "found": found,
+            "results": results
+        })
+        
     except Exception as e:
-        logger.error(f"Knowledge Graph API route error: {e}")
+        logger.error("Knowledge Graph batch route error: %s", e)
         return jsonify({
             "success": False,
             "error": "INTERNAL_ERROR",
@@ -192,12 +404,17 @@ def test_knowledge_graph():
     if not session.get("logged_in"):
         return jsonify({"error": "Authentication required"}), 401
     
+    if not KG_AVAILABLE:
+        return jsonify({
+            "test_status": "failed",
+            "api_configured": False,
+            "error": "kg_api_handler module not found",
+            "message": "Please create kg_api_handler.py file"
+        })
+    
     try:
-        from kg_api_handler import KnowledgeGraphAPI
-        
         # Use the same API key as Maps API
-        api_key = os.environ.get("GOOGLE_MAPS_API_KEY")
-        if not api_key:
+        if not GOOGLE_MAPS_API_KEY:
             return jsonify({
                 "test_status": "failed",
                 "api_configured": False,
@@ -205,11 +422,11 @@ def test_knowledge_graph():
                 "message": "GOOGLE_MAPS_API_KEY not set in environment"
             })
         
-        kg_api = KnowledgeGraphAPI(api_key)
+        kg_api = get_kg_api()
         
         # Handle POST requests for custom testing
         if request.method == "POST":
-            data = request.get_json()
+            data = request.get_json(silent=True) or {}
             business_name = data.get("business_name", "Starbucks")
             location = data.get("location", "Seattle")
             debug_mode = data.get("debug", False)
@@ -240,15 +457,8 @@ def test_knowledge_graph():
             "test_result": result
         })
         
-    except ImportError:
-        return jsonify({
-            "test_status": "failed",
-            "api_configured": False,
-            "error": "kg_api_handler module not found",
-            "message": "Please create kg_api_handler.py file"
-        })
     except Exception as e:
-        logger.error(f"Knowledge Graph test error: {e}")
+        logger.error("Knowledge Graph test error: %s", e)
         return jsonify({
             "test_status": "failed",
             "api_configured": False,
@@ -256,6 +466,16 @@ def test_knowledge_graph():
             "message": "Test failed with unexpected error"
         })
 
+def conditional_json(payload):
+    """
+    jsonify a polled payload with a short private cache lifetime and an ETag,
+    answering 304 Not Modified when the client already holds the same body
+    """
+    response = jsonify(payload)
+    response.set_etag(hashlib.blake2b(response.get_data(), digest_size=8).hexdigest())
+    response.headers["Cache-Control"] = "private, max-age=5"
+    return response.make_conditional(request)
+
 @app.route("/api/status", methods=["GET"])
 def api_status():
     """Get API status and usage information"""
@@ -264,21 +484,15 @@ def api_status():
     
     try:
         # Check if APIs are configured
-        api_key = os.environ.get("GOOGLE_MAPS_API_KEY")
-        places_enabled = bool(api_key)
+        places_enabled = bool(GOOGLE_MAPS_API_KEY)
         
         # Check Knowledge Graph availability
-        kg_enabled = False
-        try:
-            from kg_api_handler import KnowledgeGraphAPI
-            kg_enabled = True
-        except ImportError:
-            kg_enabled = False
+        kg_enabled = KG_AVAILABLE
         
-        # Get usage from session (persistent across page reloads)
-        usage_today = session.get("api_usage_today", 0)
+        # Get usage counters (persistent across page reloads)
+        usage_today = get_usage()["api_usage_today"]
         
-        return jsonify({
+        return conditional_json({
             "success": True,
             "places_enabled": places_enabled,
             "kg_enabled": kg_enabled,
@@ -288,7 +502,7 @@ def api_status():
         })
         
     except Exception as e:
-        logger.error(f"API status check failed: {e}")
+        logger.error("API status check failed: %s", e)
         return jsonify({
             "success": False,
             "error": str(e),
@@ -302,9 +516,10 @@ def get_usage_stats():
         return jsonify({"error": "Authentication required"}), 401
     
     try:
-        # Get session-based usage counts
-        places_calls = session.get("places_api_calls", 0)
-        kg_calls = session.get("kg_api_calls", 0)
+        # Get session-scoped usage counts
+        usage = get_usage()
+        places_calls = usage["places_api_calls"]
+        kg_calls = usage["kg_api_calls"]
         total_calls = places_calls + kg_calls
         
         # Calculate estimated costs (approximate pricing)
@@ -312,7 +527,10 @@ def get_usage_stats():
         kg_cost = kg_calls * 0.005  # Assuming similar pricing
         total_cost = places_cost + kg_cost
         
-        return jsonify({
+        # Lookups answered from the KG result cache - these never reached the API
+        kg_cache = get_kg_api().cache_stats() if KG_ENABLED else {"hits": 0, "misses": 0, "size": 0}
+        
+        return conditional_json({
             "success": True,
             "usage_stats": {
                 "places_api": {
@@ -321,7 +539,8 @@ def get_usage_stats():
                 },
                 "knowledge_graph": {
                     "calls_today": kg_calls,
-                    "estimated_cost": round(kg_cost, 4)
+                    "estimated_cost": round(kg_cost, 4),
+                    "cache": kg_cache
                 },
                 "total": {
                     "calls_today": total_calls,
@@ -337,7 +556,7 @@ def get_usage_stats():
         })
         
     except Exception as e:
-        logger.error(f"Usage stats error: {e}")
+        logger.error("Usage stats error: %s", e)
         return jsonify({
             "success": False,
             "error": str(e)
@@ -345,36 +564,62 @@ def get_usage_stats():
 
 @app.route("/api/increment-usage", methods=["POST"])
 def increment_usage():
-    """Increment API usage counter in session with API type tracking"""
+    """
+    Increment API usage counters with API type tracking
+    
+    Expected JSON payload, either a single event:
+    {"api_type": "places" | "kg", "count": 1}
+    or a batch of events coalesced by the frontend:
+    {"events": [{"api_type": "kg", "count": 3}, {"api_type": "places", "count": 2}]}
+    """
     if not session.get("logged_in"):
         return jsonify({"error": "Authentication required"}), 401
     
     try:
-        data = request.get_json()
-        api_type = data.get('api_type', 'unknown')  # 'places' or 'kg'
-        count = data.get('count', 1)
+        data = request.get_json(silent=True)
+        if not data or not isinstance(data, dict):
+            return jsonify({"error": "JSON payload required"}), 400
+        
+        events = data.get('events')
+        if events is None:
+            events = [data]
+        if not isinstance(events, list) or not all(isinstance(event, dict) for event in events):
+            return jsonify({"error": "events must be a list of objects"}), 400
         
-        # Track by API type
-        if api_type == 'places':
-            session['places_api_calls'] = session.get('places_api_calls', 0) + count
-        elif api_type == 'kg':
-            session['kg_api_calls'] = session.get('kg_api_calls', 0) + count
+        # Sum the deltas first so the counters are written once per request
+        places_delta = kg_delta = total_delta = 0
+        for event in events:
+            api_type = event.get('api_type', 'unknown')  # 'places' or 'kg'
+            count = event.get('count', 1)
+            # bool is an int subclass, and a negative count would decrement the counters
+            if isinstance(count, bool) or not isinstance(count, int) or count < 0:
+                return jsonify({"error": "count must be a non-negative integer"}), 400
+            if api_type == 'places':
+                places_delta += count
+            elif api_type == 'kg':
+                kg_delta += count
+            total_delta += count
         
-        # Legacy total counter
-        session['api_usage_today'] = session.get('api_usage_today', 0) + count
+        # api_usage_today is the legacy total counter
+        usage = add_usage(total=total_delta, places=places_delta, kg=kg_delta)
         
         # Set session start time if not exists
         if 'session_start' not in session:
-            session['session_start'] = datetime.now().isoformat()
+            session['session_start'] = _now_iso()
         
         return jsonify({
             "success": True,
-            "usage_today": session['api_usage_today'],
-            "places_calls": session.get('places_api_calls', 0),
-            "kg_calls": session.get('kg_api_calls', 0)
+            "usage_today": usage['api_usage_today'],
+            "places_calls": usage['places_api_calls'],
+            "kg_calls": usage['kg_api_calls']
         })
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
+        logger.error("Usage increment error: %s", e)
+        return jsonify({
+            "success": False,
+            "error": "INTERNAL_ERROR",
+            "message": "Internal server error occurred"
+        }), 500
 
 if __name__ == "__main__":
     app.run(debug=True)
\ No newline at end of file
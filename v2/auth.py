@@ -1,5 +1,7 @@
 from flask import Blueprint, redirect, request, session, url_for
 from google_auth_oauthlib.flow import Flow
+from functools import lru_cache
+import json
 import os
 
 auth_bp = Blueprint("auth", __name__)
@@ -8,25 +10,33 @@ os.environ["OAUTHLIB_INSECURE_TRANSPORT"] = "1"  # Allow http for local dev
 
 # NOTE: Must match the OAuth redirect URI in Google Cloud Console
 REDIRECT_URI = "http://localhost:5000/oauth2callback"
+CLIENT_SECRETS_FILE = "credentials.json"
 
 
-@auth_bp.route("/login")
-def login():
-    flow = Flow.from_client_secrets_file(
-        "credentials.json",
+@lru_cache(maxsize=1)
+def _client_config():
+    """Read and parse the OAuth client secrets once per process"""
+    with open(CLIENT_SECRETS_FILE) as f:
+        return json.load(f)
+
+
+def _build_flow():
+    """Create an OAuth flow from the cached client config"""
+    return Flow.from_client_config(
+        _client_config(),
         scopes=SCOPES,
         redirect_uri=REDIRECT_URI
     )
+
+
+@auth_bp.route("/login")
+def login():
+    flow = _build_flow()
     authorization_url, state = flow.authorization_url(
         access_type="offline",
         include_granted_scopes="true"
     )
     session["state"] = state
-    session["flow_info"] = {
-        "client_secrets_file": "credentials.json",
-        "scopes": SCOPES,
-        "redirect_uri": REDIRECT_URI
-    }
     return redirect(authorization_url)
 
 
@@ -35,26 +45,16 @@ def logout():
     """
     Clear all session data and redirect to the login info page.
     """
-    try:
-        keys = list(session.keys())
-        for k in keys:
-            session.pop(k, None)
-    except Exception:
-        # As a safe fallback, nuke the whole session
-        session.clear()
+    session.clear()
     return redirect(url_for("login_info"))
 
 
 @auth_bp.route("/oauth2callback")
 def oauth2callback():
-    if "state" not in session or "flow_info" not in session:
-        return "Missing session state or flow info. Please try logging in again."
+    if "state" not in session:
+        return "Missing session state. Please try logging in again."
 
-    flow = Flow.from_client_secrets_file(
-        session["flow_info"]["client_secrets_file"],
-        scopes=session["flow_info"]["scopes"],
-        redirect_uri=session["flow_info"]["redirect_uri"]
-    )
+    flow = _build_flow()
     flow.fetch_token(authorization_response=request.url)
 
     if not flow.credentials:
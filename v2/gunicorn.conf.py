@@ -0,0 +1,20 @@
+# FILE: gunicorn.conf.py
+# Gunicorn settings for production - run with: gunicorn -c gunicorn.conf.py app:app
+
+import os
+
+bind = os.environ.get("GUNICORN_BIND", "127.0.0.1:5000")
+
+# (2 x CPU) + 1 workers; set WEB_CONCURRENCY to cap this on small VMs
+workers = int(os.environ.get("WEB_CONCURRENCY", (os.cpu_count() or 1) * 2 + 1))
+# Workers inherit this, so kg_api_handler can split the Knowledge Graph quota between them
+os.environ["WEB_CONCURRENCY"] = str(workers)
+
+# Knowledge Graph calls spend most of their time waiting on Google, so each worker
+# runs several threads. Set GUNICORN_WORKER_CLASS=gevent for green threads instead.
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+worker_connections = 1000  # gevent only
+
+# Let browsers reuse the connection across the dashboard's /api/* polls
+keepalive = 5
@@ -7,28 +7,219 @@ Knowledge Graph API Handler for Google Maps Intelligence Tool
 Handles Knowledge Graph Search API calls to fetch entity data including KG IDs
 """
 
+import orjson
 import requests
-import json
+import requests_cache
+from requests.adapters import HTTPAdapter
+from requests.utils import get_environ_proxies
+from urllib3.exceptions import InvalidHeader, MaxRetryError, ResponseError
+from urllib3.util import Retry
+from cachetools import TTLCache
+from rapidfuzz import fuzz, process
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from threading import Lock
+import math
 import os
 import time
-from typing import Dict, List, Optional, Any
-from urllib.parse import urlencode
+from typing import Dict, List, Optional, Any, Sequence, Tuple
+from urllib.parse import urlencode, quote_plus
 import logging
+import re
 
-# Set up logging
-DEBUG_MODE = os.environ.get("DEBUG", "False").lower() == "true"
+# Knowledge Graph entities change slowly, so identical lookups are served from memory for an hour
+CACHE_MAXSIZE = 1024
+CACHE_TTL_SECONDS = 3600
 
-# Update the logger configuration
-if DEBUG_MODE:
-    logging.basicConfig(level=logging.DEBUG)
-else:
-    logging.basicConfig(level=logging.WARNING)  # Only warnings and errors in production
+# Raw API responses are also kept on disk so repeat audits survive restarts without spending quota.
+# Search rankings can shift, so they expire after a day; entities fetched by ID are stable for a week.
+HTTP_CACHE_PATH = os.environ.get("KG_HTTP_CACHE", "kg_cache.sqlite")
+SEARCH_CACHE_EXPIRE = 24 * 3600
+ID_CACHE_EXPIRE = 7 * 24 * 3600
+
+# KG lookups are almost entirely network wait, so batch lookups fan out over a shared thread pool
+BATCH_MAX_WORKERS = 16
+_batch_pool = ThreadPoolExecutor(max_workers=BATCH_MAX_WORKERS, thread_name_prefix="kg-batch")
+
+# Keep-alive connections held open to kgsearch.googleapis.com - sized for the batch pool's
+# worker threads plus concurrent single lookups from the web workers
+HTTP_POOL_MAXSIZE = 32
+
+# Client-side cap on requests actually sent to the API (cache hits are free), so parallel lookups
+# queue up instead of all drawing 429s at once. The KG API default quota is about 600 per minute and
+# every process has its own bucket, so by default each gunicorn worker (gunicorn.conf.py exports the
+# count as WEB_CONCURRENCY) takes an equal share. KG_RATE_LIMIT_PER_MINUTE sets the per-process
+# limit directly; 0 disables it.
+KG_QUOTA_PER_MINUTE = 600
+RATE_LIMIT_PER_MINUTE = int(
+    os.environ.get("KG_RATE_LIMIT_PER_MINUTE")
+    or KG_QUOTA_PER_MINUTE // max(1, int(os.environ.get("WEB_CONCURRENCY", "1")))
+)
+
+# Retries run inside a synchronous web request, so a Retry-After longer than this ends them at once
+# and the caller reports it (QUOTA_EXCEEDED with retry_after) instead of sleeping it out
+RETRY_AFTER_MAX_SECONDS = 5
+
+
+class BoundedRetry(Retry):
+    """
+    Retry that gives up instead of honouring a Retry-After longer than RETRY_AFTER_MAX_SECONDS,
+    and takes a rate limiter token for every re-send
+    """
+    
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        if response is not None:
+            try:
+                retry_after = self.get_retry_after(response)
+            except InvalidHeader:
+                retry_after = None
+            if retry_after is not None and retry_after > RETRY_AFTER_MAX_SECONDS:
+                # With raise_on_status=False urllib3 hands back this last response unchanged
+                raise MaxRetryError(_pool, url, ResponseError(f"Retry-After {retry_after:.0f}s is too long to wait"))
+        return super().increment(method, url, response, error, _pool, _stacktrace)
+    
+    def sleep(self, response=None):
+        super().sleep(response)
+        # Re-sends happen inside HTTPAdapter.send, past RateLimitedAdapter's single acquire()
+        if _rate_limiter is not None:
+            _rate_limiter.acquire()
+
+
+# Throttling (429) and transient 5xx answers get up to three retries with jittered exponential
+# backoff (capped at a few seconds per wait), honouring a short Retry-After - a few seconds at most
+# per call, since this runs inside a web request. Read timeouts are not retried - each already
+# waited the full timeout - and connect errors get two quick retries. The last response is
+# returned as-is so callers still report QUOTA_EXCEEDED/API_ERROR.
+HTTP_RETRY = BoundedRetry(
+    total=5,
+    connect=2,
+    read=False,
+    status=3,
+    backoff_factor=0.5,
+    backoff_max=4,
+    backoff_jitter=0.5,
+    status_forcelist=[429, 500, 502, 503, 504],
+    respect_retry_after_header=True,
+    raise_on_status=False
+)
+
+# Each business search query is sent once without a type filter; this many results cover what the
+# separate type-filtered searches used to return, and the type tiers are applied locally
+BROAD_SEARCH_LIMIT = 50
+
+# The API accepts many ids= parameters per call; this many MIDs share one request
+ID_BATCH_SIZE = 50
+
+# Google Place IDs are URL-safe tokens; the UI sends placeholders like "N/A" when it has none
+PLACE_ID_RE = re.compile(r'^[A-Za-z0-9_-]{10,}$')
+
+# Common business suffixes stripped by _clean_business_name, plus its punctuation/space cleanup
+BUSINESS_SUFFIX_RE = re.compile(
+    r'\b(LLC|Inc|Corp|Corporation|Company|Co|Ltd|Limited|LP|LLP'
+    r'|Restaurant|Cafe|Coffee|Shop|Store|Market|Center|Centre'
+    r'|Services|Service|Group|Associates|Solutions)\b',
+    re.IGNORECASE
+)
+PUNCTUATION_RE = re.compile(r'[^\w\s]')
+WHITESPACE_RE = re.compile(r'\s+')
+# Words compared when scoring a location against an entity description
+WORD_RE = re.compile(r'\w+')
+
+# Entity types that earn the business type bonus in _find_best_match
+BUSINESS_TYPES = frozenset({'LocalBusiness', 'Organization', 'Place', 'Corporation'})
+
+# Set up logging - level and handlers are configured by the application (app.py)
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1024)
+def _clean_business_name(name: str) -> str:
+    """Remove common business suffixes and clean name for better matching"""
+    cleaned = BUSINESS_SUFFIX_RE.sub('', name)
+    
+    # Clean up extra spaces and punctuation
+    cleaned = PUNCTUATION_RE.sub(' ', cleaned)
+    return WHITESPACE_RE.sub(' ', cleaned).strip()
+
+
+@lru_cache(maxsize=4096)
+def _entity_text(name: str, description: str) -> Tuple[str, str, frozenset]:
+    """Lowercased name, description and description words of a candidate entity for matching"""
+    description_lower = description.lower()
+    return name.lower(), description_lower, frozenset(WORD_RE.findall(description_lower))
+
+
+def _quota_exceeded(response: requests.Response) -> Dict[str, Any]:
+    """Build the QUOTA_EXCEEDED result for a 429 that outlasted the retries, with the server's Retry-After"""
+    retry_after = None
+    header = response.headers.get('Retry-After')
+    if header:
+        try:
+            # Accepts both delta-seconds and HTTP-date forms
+            retry_after = math.ceil(HTTP_RETRY.parse_retry_after(header))
+        except InvalidHeader:
+            pass
+    logger.error("Knowledge Graph API quota exceeded (Retry-After: %s)", retry_after)
+    return {
+        'success': False,
+        'error': 'QUOTA_EXCEEDED',
+        'message': f'API quota exceeded. Try again in {retry_after} seconds.' if retry_after
+                   else 'API quota exceeded. Try again later.',
+        'status_code': 429,
+        'retry_after': retry_after
+    }
+
+
+def _entity_types(entity: Dict) -> Sequence[str]:
+    """Return an entity's @type as a sequence - single-typed entities can carry a bare string"""
+    types = entity.get('@type', ())
+    return (types,) if isinstance(types, str) else types
+
+
+class TokenBucket:
+    """Thread-safe token bucket that refills continuously at a fixed rate"""
+    
+    __slots__ = ('rate', 'capacity', '_tokens', '_updated', '_lock')
+    
+    def __init__(self, per_minute: int):
+        self.rate = per_minute / 60.0
+        # Allow a burst of ten seconds' worth of requests, then settle to the steady rate
+        self.capacity = max(1.0, per_minute / 6.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = Lock()
+    
+    def acquire(self) -> None:
+        """Take one token, sleeping until it is available"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Going negative reserves the next token, so waiting callers are served in turn
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+_rate_limiter = TokenBucket(RATE_LIMIT_PER_MINUTE) if RATE_LIMIT_PER_MINUTE > 0 else None
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """HTTPAdapter that takes a token from the shared rate limiter before each request it sends"""
+    
+    def send(self, request, **kwargs):
+        if _rate_limiter is not None:
+            _rate_limiter.acquire()
+        return super().send(request, **kwargs)
+
+
 class KnowledgeGraphAPI:
     """Handler for Google Knowledge Graph Search API"""
     
+    __slots__ = ('api_key', 'base_url', 'session', '_cache', '_lock', '_query_suffixes',
+                 '_cache_hits', '_cache_misses')
+    
     def __init__(self, api_key: str = None):
         """
         Initialize the Knowledge Graph API handler
@@ -38,7 +229,32 @@ class KnowledgeGraphAPI:
         """
         self.api_key = api_key or os.environ.get("GOOGLE_API_KEY")
         self.base_url = "https://kgsearch.googleapis.com/v1/entities:search"
-        self.session = requests.Session()
+        # The API key is left out of the cache key, so rotating keys doesn't orphan the cache
+        self.session = requests_cache.CachedSession(
+            HTTP_CACHE_PATH,
+            backend='sqlite',
+            wal=True,
+            expire_after=SEARCH_CACHE_EXPIRE,
+            allowable_codes=(200,),
+            allowable_methods=('GET',),
+            ignored_parameters=['key']
+        )
+        # Keep a pool of connections to kgsearch.googleapis.com so repeat lookups skip the TLS handshake.
+        # Every call goes to that one host, so a single host pool is enough.
+        # Responses served by requests-cache never reach the adapter, so only real API calls are rate limited.
+        self.session.mount("https://", RateLimitedAdapter(pool_connections=1, pool_maxsize=HTTP_POOL_MAXSIZE,
+                                                          max_retries=HTTP_RETRY))
+        # Resolve proxy and CA bundle settings from the environment once; with trust_env left on,
+        # requests re-reads them (and ~/.netrc) on every call
+        self.session.proxies.update(get_environ_proxies(self.base_url))
+        self.session.verify = os.environ.get("REQUESTS_CA_BUNDLE") or os.environ.get("CURL_CA_BUNDLE") or True
+        self.session.trust_env = False
+        self._cache = TTLCache(maxsize=CACHE_MAXSIZE, ttl=CACHE_TTL_SECONDS)
+        self._lock = Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        # Encoded query-string tails keyed by (limit, types, languages) - only 'query' varies per call
+        self._query_suffixes = {}
         
         if not self.api_key:
             raise ValueError("API key is required. Set GOOGLE_API_KEY environment variable or pass api_key parameter.")
@@ -60,34 +276,30 @@ class KnowledgeGraphAPI:
         Returns:
             Dictionary containing the API response with entity data
         """
-        params = {
-            'query': query,
-            'limit': min(limit, 500),  # API maximum is 500
-            'indent': True,
-            'key': self.api_key
-        }
-        
-        if types:
-            params['types'] = types
-            
-        if languages:
-            params['languages'] = languages
+        params_key = (limit, tuple(types or ()), tuple(languages or ()))
+        # Searches are case-insensitive and filter order doesn't matter, so normalize the cache key
+        cache_key = ('search', query.strip().lower(), limit, tuple(sorted(params_key[1])), params_key[2])
+        with self._lock:
+            cached = self._cache.get(cache_key)
+        if cached is not None:
+            return dict(cached, cached=True)
         
         try:
-            if DEBUG_MODE:
-                logger.debug(f"Searching Knowledge Graph for: {query}")
-            response = self.session.get(self.base_url, params=params, timeout=30)
+            logger.debug("Searching Knowledge Graph for: %s", query)
+            response, data = self._get(f"query={quote_plus(query)}&{self._query_suffix(params_key)}")
             
-            if response.status_code == 200:
-                data = response.json()
-                if DEBUG_MODE:
-                    logger.debug(f"Found {len(data.get('itemListElement', []))} entities")
-                return {
+            if data is not None:
+                logger.debug("Found %s entities", len(data.get('itemListElement', [])))
+                result = {
                     'success': True,
                     'data': data,
                     'query': query,
-                    'total_results': len(data.get('itemListElement', []))
+                    'total_results': len(data.get('itemListElement', [])),
+                    'cached': response.from_cache
                 }
+                with self._lock:
+                    self._cache[cache_key] = result
+                return result
             elif response.status_code == 403:
                 logger.error("Knowledge Graph API access denied - check API key and permissions")
                 return {
@@ -97,15 +309,9 @@ class KnowledgeGraphAPI:
                     'status_code': 403
                 }
             elif response.status_code == 429:
-                logger.error("Knowledge Graph API quota exceeded")
-                return {
-                    'success': False,
-                    'error': 'QUOTA_EXCEEDED',
-                    'message': 'API quota exceeded. Try again later.',
-                    'status_code': 429
-                }
+                return _quota_exceeded(response)
             else:
-                logger.error(f"Knowledge Graph API error: {response.status_code}")
+                logger.error("Knowledge Graph API error: %s", response.status_code)
                 return {
                     'success': False,
                     'error': 'API_ERROR',
@@ -121,47 +327,67 @@ class KnowledgeGraphAPI:
                 'message': 'Request timeout after 30 seconds'
             }
         except requests.exceptions.RequestException as e:
-            logger.error(f"Knowledge Graph API request failed: {e}")
+            logger.error("Knowledge Graph API request failed: %s", e)
             return {
                 'success': False,
                 'error': 'NETWORK_ERROR',
                 'message': f'Network error: {str(e)}'
             }
  
+    def _get(self, query_string: str, expire_after: int = SEARCH_CACHE_EXPIRE) -> Tuple[requests.Response, Optional[Dict]]:
+        """
+        Send one request to the Knowledge Graph API - every call goes through here, and so through
+        the session's response cache, rate limiter and retry policy
+        
+        Args:
+            query_string: Encoded query parameters, including the API key
+            expire_after: Seconds the response stays in the on-disk cache
+            
+        Returns:
+            Tuple of the response and its parsed JSON body (None unless the status is 200) - the
+            response's from_cache is True when the on-disk cache answered and no API call was made
+        """
+        response = self.session.get(f"{self.base_url}?{query_string}", timeout=30, expire_after=expire_after)
+        # orjson parses straight from the response bytes, skipping the str decode
+        data = orjson.loads(response.content) if response.status_code == 200 else None
+        return response, data
+
+    def _ids_query(self, kgmids: List[str]) -> str:
+        """Encode an ID lookup - the API takes one ids= parameter per MID"""
+        params = [('ids', kgmid) for kgmid in kgmids]
+        params.append(('key', self.api_key))
+        return urlencode(params)
+
+    def _query_suffix(self, params_key: tuple) -> str:
+        """Return the encoded non-query parameters for a search, building them on first use"""
+        suffix = self._query_suffixes.get(params_key)
+        if suffix is None:
+            limit, types, languages = params_key
+            params = [
+                ('limit', min(limit, 500)),  # API maximum is 500
+                ('key', self.api_key)
+            ]
+            params.extend(('types', t) for t in types)
+            params.extend(('languages', lang) for lang in languages)
+            suffix = urlencode(params)
+            self._query_suffixes[params_key] = suffix
+        return suffix
+
     def _extract_entity_data(self, entity: Dict) -> Dict[str, Any]:
         """Extract relevant data from a Knowledge Graph entity"""
+        image = entity.get('image') or {}
+        detailed = entity.get('detailedDescription') or {}
         return {
             'kg_id': entity.get('@id', 'Not available'),
             'name': entity.get('name', 'Not available'),
             'description': entity.get('description', 'Not available'),
             'types': entity.get('@type', []),
             'url': entity.get('url', 'Not available'),
-            'image_url': entity.get('image', {}).get('contentUrl', 'Not available') if entity.get('image') else 'Not available',
-            'detailed_description': entity.get('detailedDescription', {}).get('articleBody', 'Not available') if entity.get('detailedDescription') else 'Not available',
-            'detailed_description_url': entity.get('detailedDescription', {}).get('url', 'Not available') if entity.get('detailedDescription') else 'Not available'
+            'image_url': image.get('contentUrl', 'Not available'),
+            'detailed_description': detailed.get('articleBody', 'Not available'),
+            'detailed_description_url': detailed.get('url', 'Not available')
         }
 
-    def _clean_business_name(self, name: str) -> str:
-        """Remove common business suffixes and clean name for better matching"""
-        import re
-        
-        # Common business suffixes to remove
-        suffixes = [
-            r'\b(LLC|Inc|Corp|Corporation|Company|Co|Ltd|Limited|LP|LLP)\b',
-            r'\b(Restaurant|Cafe|Coffee|Shop|Store|Market|Center|Centre)\b',
-            r'\b(Services|Service|Group|Associates|Solutions)\b'
-        ]
-        
-        cleaned = name
-        for suffix in suffixes:
-            cleaned = re.sub(suffix, '', cleaned, flags=re.IGNORECASE)
-        
-        # Clean up extra spaces and punctuation
-        cleaned = re.sub(r'[^\w\s]', ' ', cleaned)
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
-        
-        return cleaned
-
     def _find_best_match(self, entities: List[Dict], target_name: str, location: str = None) -> Optional[Dict]:
         """Enhanced matching algorithm with multiple scoring factors"""
         if not entities:
@@ -172,40 +398,44 @@ class KnowledgeGraphAPI:
         
         target_lower = target_name.lower()
         location_lower = location.lower() if location else ""
+        location_words = set(WORD_RE.findall(location_lower))
+        
+        # Highest combined score any candidate can reach - nothing later in the list can beat it
+        max_score = 1.0 * 0.5 + 1.0 * 0.3 + (0.3 if location_lower else 0) + 0.2
         
+        # The same entity turns up in many searches for one business (and in cached results
+        # across lookups), so its lowercased text comes from _entity_text's cache rather than
+        # being stored on the entity dicts, which batch threads share and callers serialize
+        memos = []
         for item in entities:
             result = item.get('result', {})
-            name = result.get('name', '').lower()
-            description = result.get('description', '').lower()
+            memos.append(_entity_text(result.get('name', ''), result.get('description', '')))
+        
+        # Name similarity scoring - token set ratio ignores word order and extra words.
+        # All candidates are scored in one call into rapidfuzz's C code; limit=None keeps every
+        # candidate and the index maps each score back to its position in the list
+        names = [memo[0] for memo in memos]
+        name_scores = [0.0] * len(names)
+        for _, score, index in process.extract(target_lower, names, scorer=fuzz.token_set_ratio,
+                                               processor=None, limit=None):
+            name_scores[index] = score / 100.0
+        
+        for item, name_score, memo in zip(entities, name_scores, memos):
+            result = item.get('result', {})
+            _, description, description_words = memo
             result_score = item.get('resultScore', 0)
             
-            # Name similarity scoring
-            name_score = 0
-            if target_lower == name:
-                name_score = 1.0  # Exact match
-            elif target_lower in name or name in target_lower:
-                name_score = 0.8  # Partial match
-            else:
-                # Word overlap scoring
-                target_words = set(target_lower.split())
-                name_words = set(name.split())
-                if target_words and name_words:
-                    overlap = len(target_words.intersection(name_words))
-                    name_score = overlap / max(len(target_words), len(name_words))
-            
             # Location scoring (if provided)
             location_score = 0
             if location_lower:
-                if location_lower in description or any(loc_word in description for loc_word in location_lower.split()):
+                # Whole-word overlap, so "austin" doesn't match inside "exhaustion"
+                if location_lower in description or not location_words.isdisjoint(description_words):
                     location_score = 0.3
             
             # Entity type scoring (prefer business-related types)
             type_score = 0
-            entity_types = result.get('@type', [])
-            if isinstance(entity_types, list):
-                business_types = ['LocalBusiness', 'Organization', 'Place', 'Corporation']
-                if any(btype in entity_types for btype in business_types):
-                    type_score = 0.2
+            if not BUSINESS_TYPES.isdisjoint(_entity_types(result)):
+                type_score = 0.2
             
             # Combined scoring
             # Normalize result_score (typically 0-1000)
@@ -226,6 +456,8 @@ class KnowledgeGraphAPI:
                     'name_score': name_score,
                     'result_score': result_score
                 }
+                if combined_score >= max_score:
+                    break
         
         # Only return matches with reasonable confidence
         if best_match and best_match['score'] >= 0.3:
@@ -233,7 +465,8 @@ class KnowledgeGraphAPI:
         
         return None
 
-    def find_business_entity(self, business_name: str, location: str = None, kgmid: str = None) -> Dict[str, Any]:
+    def find_business_entity(self, business_name: str, location: str = None, kgmid: str = None,
+                             place_id: str = None, kgmid_result: Dict[str, Any] = None) -> Dict[str, Any]:
         """
         Search for a specific business entity with enhanced matching
         
@@ -241,17 +474,97 @@ class KnowledgeGraphAPI:
             business_name: Name of the business
             location: Optional location to help with disambiguation
             kgmid: Optional Knowledge Graph MID extracted from URL
+            place_id: Optional Google Place ID - a place already resolved once skips the search entirely
+            kgmid_result: Optional result for kgmid already fetched by get_entities_by_ids
             
         Returns:
             Dictionary with the best matching entity or error information
         """
+        cache_keys = [('business', business_name.lower(), (location or "").lower(), kgmid or "")]
+        if place_id and PLACE_ID_RE.match(place_id):
+            # The KG API cannot look up Place IDs, but a Place ID pins the business exactly,
+            # so it is the most specific key to remember a resolved entity under
+            cache_keys.insert(0, ('place', place_id))
+        
+        with self._lock:
+            for cache_key in cache_keys:
+                cached = self._cache.get(cache_key)
+                if cached is not None:
+                    self._cache_hits += 1
+                    # Callers add their own metadata to the result, so hand out a copy
+                    result = dict(cached)
+                    result['cached'] = True
+                    return result
+            self._cache_misses += 1
+        
+        result = self._search_business_entity(business_name, location, kgmid, kgmid_result)
+        
+        # Only cache hits - a miss may just be a transient API error swallowed by the search loop
+        if result.get('success') and result.get('entity'):
+            with self._lock:
+                for cache_key in cache_keys:
+                    self._cache[cache_key] = dict(result)
+        return result
+
+    def find_business_entities_batch(self, businesses: List[Sequence]) -> List[Dict[str, Any]]:
+        """
+        Look up several businesses concurrently
+        
+        Args:
+            businesses: Tuples of find_business_entity arguments - (business_name, location, kgmid, place_id),
+                        trailing items optional
+            
+        Returns:
+            One find_business_entity result per business, in the order given
+        """
+        # Resolve every KG ID up front - one ids= request instead of one per business
+        kgmids = [business[2] for business in businesses if len(business) > 2 and business[2]]
+        kgmid_results = self.get_entities_by_ids(kgmids) if kgmids else {}
+        
+        futures = {}
+        for index, business in enumerate(businesses):
+            business_name, location, kgmid, place_id = (tuple(business) + (None, None, None))[:4]
+            future = _batch_pool.submit(self.find_business_entity, business_name, location, kgmid, place_id,
+                                        kgmid_results.get(kgmid))
+            futures[future] = index
+        
+        # Collect as they finish, but return results in request order
+        results = [None] * len(businesses)
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                results[index] = future.result()
+            except Exception as e:
+                logger.error("Knowledge Graph batch lookup failed: %s", e)
+                results[index] = {
+                    'success': False,
+                    'error': 'INTERNAL_ERROR',
+                    'message': 'Lookup failed'
+                }
+        return results
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Return business lookup cache counters for usage reporting"""
+        with self._lock:
+            return {
+                'hits': self._cache_hits,
+                'misses': self._cache_misses,
+                'size': len(self._cache)
+            }
+
+    def _search_business_entity(self, business_name: str, location: str = None, kgmid: str = None,
+                                kgmid_result: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Run the uncached multi-strategy search behind find_business_entity"""
         # If we have a KG ID from the URL, try to fetch it directly
+        # Whether each lookup behind the result was answered from a cache - only a result that
+        # made no API call at all is marked cached and left out of usage billing
+        from_cache = []
         if kgmid:
-            if DEBUG_MODE:
-                logger.debug(f"Attempting direct lookup with KG ID: {kgmid}")
-            direct_result = self.get_entity_by_id(kgmid)
+            logger.debug("Attempting direct lookup with KG ID: %s", kgmid)
+            direct_result = kgmid_result or self.get_entity_by_id(kgmid)
             if direct_result and direct_result.get('success'):
                 return direct_result
+            from_cache.append(bool(direct_result and direct_result.get('cached')))
         
         # Try multiple search strategies with business-specific focus
         search_queries = []
@@ -267,59 +580,25 @@ class KnowledgeGraphAPI:
         search_queries.append(business_name)
         
         # Strategy 4: Clean business name (remove common suffixes)
-        clean_name = self._clean_business_name(business_name)
+        clean_name = _clean_business_name(business_name)
         if clean_name != business_name and location:
             search_queries.append(f'"{clean_name}" {location}')
         
-        # Prioritize business types over person types
-        entity_types = [
-            ['LocalBusiness'],  # Most specific
-            ['Organization', 'Corporation'],
-            ['Place'],
-            ['LocalBusiness', 'Organization', 'Place'],
-            None  # No type restriction as last resort
-        ]
-        
         best_result = None
         best_score = 0
-        
-        for query in search_queries:
-            for types in entity_types:
-                result = self.search_entity(
-                    query=query,
-                    types=types,
-                    limit=20
-                )
-                
-                if not result['success']:
-                    continue
-                
-                entities = result['data'].get('itemListElement', [])
-                if not entities:
-                    continue
-                
-                # Filter out person entities when searching for businesses
-                business_entities = []
-                for item in entities:
-                    entity_types = item.get('result', {}).get('@type', [])
-                    # Skip if it's primarily a Person entity
-                    if 'Person' not in entity_types:
-                        business_entities.append(item)
-                
-                if not business_entities:
-                    continue
-                
-                # Find best match from filtered results
-                match = self._find_best_match(business_entities, business_name, location)
-                if match and match['score'] > best_score:
-                    best_score = match['score']
-                    best_result = match['entity']
-                    # If we find a high-confidence match, stop searching
-                    if match['score'] > 0.8:
-                        break
-            
-            if best_score > 0.8:
-                break
+        search_errors = []
+        
+        # One flat pass over every query x type tier in priority order
+        for business_entities in self._search_tiers(search_queries, search_errors, from_cache):
+            # Find best match from the tier's results
+            match = self._find_best_match(business_entities, business_name, location)
+            if match and match['score'] > best_score:
+                best_score = match['score']
+                best_result = match['entity']
+                # If we find a high-confidence match, stop searching - leaving the generator
+                # skips the remaining tiers and queries
+                if match['score'] > 0.8:
+                    break
         
         if best_result:
             entity_data = self._extract_entity_data(best_result)
@@ -327,8 +606,13 @@ class KnowledgeGraphAPI:
                 'success': True,
                 'entity': entity_data,
                 'message': f"Found entity: {entity_data.get('name', 'Unknown')} (score: {best_score:.2f})",
-                'kg_id': entity_data.get('kg_id', 'Not available')
+                'kg_id': entity_data.get('kg_id', 'Not available'),
+                'cached': all(from_cache)
             }
+        elif search_errors:
+            # A failed search may have held the match, so report its error (with Retry-After for
+            # a quota error) instead of claiming the business isn't in the Knowledge Graph
+            return search_errors[-1]
         else:
             return {
                 'success': True,
@@ -337,6 +621,49 @@ class KnowledgeGraphAPI:
                 'kg_id': 'Not found'
             }
 
+    def _search_tiers(self, search_queries: List[str], search_errors: List[Dict[str, Any]],
+                      from_cache: List[bool]):
+        """
+        Run one unfiltered search per query and yield its non-person results in type tiers,
+        most specific first - the same priority the type-filtered searches used to follow.
+        A search rejected with QUOTA_EXCEEDED or a 5xx API_ERROR is appended to search_errors
+        and ends the search - the remaining queries would only sit through the same retries again.
+        Whether each search was answered from a cache is appended to from_cache.
+        """
+        # Prioritize business types over person types
+        type_tiers = [
+            {'LocalBusiness'},  # Most specific
+            {'Organization', 'Corporation'},
+            {'Place'},
+            None  # No type restriction as last resort
+        ]
+        
+        for query in search_queries:
+            result = self.search_entity(query=query, limit=BROAD_SEARCH_LIMIT)
+            from_cache.append(result.get('cached', False))
+            if not result['success']:
+                if result.get('error') == 'QUOTA_EXCEEDED' or result.get('status_code', 0) >= 500:
+                    search_errors.append(result)
+                    return
+                continue
+            
+            # Filter out person entities when searching for businesses
+            business_entities = []
+            for item in result['data'].get('itemListElement', []):
+                item_types = _entity_types(item.get('result', {}))
+                # Skip if it's primarily a Person entity
+                if 'Person' not in item_types:
+                    business_entities.append(item)
+            
+            for tier in type_tiers:
+                if tier is None:
+                    entities = business_entities
+                else:
+                    entities = [item for item in business_entities
+                                if not tier.isdisjoint(_entity_types(item.get('result', {})))]
+                if entities:
+                    yield entities
+
     def get_entity_by_id(self, kgmid: str) -> Dict[str, Any]:
         """
         Fetch entity directly by Knowledge Graph MID
@@ -347,39 +674,44 @@ class KnowledgeGraphAPI:
         Returns:
             Dictionary with entity data or error information
         """
-        params = {
-            'ids': kgmid,
-            'indent': True,
-            'key': self.api_key
-        }
+        cache_key = ('id', kgmid)
+        with self._lock:
+            cached = self._cache.get(cache_key)
+        if cached is not None:
+            # Callers add their own metadata to the result, so hand out a copy
+            return dict(cached, cached=True)
         
         try:
-            if DEBUG_MODE:
-                logger.debug(f"Fetching entity by ID: {kgmid}")
-            response = self.session.get(self.base_url, params=params, timeout=30)
+            logger.debug("Fetching entity by ID: %s", kgmid)
+            response, data = self._get(self._ids_query([kgmid]), ID_CACHE_EXPIRE)
             
-            if response.status_code == 200:
-                data = response.json()
+            if data is not None:
                 entities = data.get('itemListElement', [])
                 
                 if entities:
                     entity = entities[0].get('result', {})
                     entity_data = self._extract_entity_data(entity)
-                    return {
+                    result = {
                         'success': True,
                         'entity': entity_data,
                         'message': f"Found entity by ID: {entity_data.get('name', 'Unknown')}",
-                        'kg_id': entity_data.get('kg_id', kgmid)
+                        'kg_id': entity_data.get('kg_id', kgmid),
+                        'cached': response.from_cache
                     }
+                    with self._lock:
+                        self._cache[cache_key] = dict(result)
+                    return result
                 else:
-                    logger.error(f"No entity found for KG ID: {kgmid}")
+                    logger.error("No entity found for KG ID: %s", kgmid)
                     return {
                         'success': False,
                         'error': 'NOT_FOUND',
                         'message': f'No entity found for KG ID: {kgmid}'
                     }
+            elif response.status_code == 429:
+                return _quota_exceeded(response)
             else:
-                logger.error(f"Failed to fetch entity by ID: {response.status_code}")
+                logger.error("Failed to fetch entity by ID: %s", response.status_code)
                 return {
                     'success': False,
                     'error': 'API_ERROR',
@@ -387,13 +719,70 @@ class KnowledgeGraphAPI:
                 }
                 
         except Exception as e:
-            logger.error(f"Error fetching entity by ID: {e}")
+            logger.error("Error fetching entity by ID: %s", e)
             return {
                 'success': False,
                 'error': 'FETCH_ERROR',
                 'message': str(e)
             }
 
+    def get_entities_by_ids(self, kgmids: List[str], batch_size: int = ID_BATCH_SIZE) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch many entities by Knowledge Graph MID with one request per batch
+        
+        Args:
+            kgmids: Knowledge Graph MIDs (e.g., ['/g/11bzt6slj6', '/m/0fhp9'])
+            batch_size: MIDs sent per request as repeated ids= parameters
+            
+        Returns:
+            Dictionary mapping each resolved MID to the same result get_entity_by_id returns -
+            unresolved MIDs are omitted
+        """
+        unique_ids = list(dict.fromkeys(kgmids))
+        results = {}
+        
+        # Serve already-resolved MIDs from the cache and only request the rest
+        with self._lock:
+            for kgmid in unique_ids:
+                cached = self._cache.get(('id', kgmid))
+                if cached is not None:
+                    results[kgmid] = dict(cached, cached=True)
+        missing = [kgmid for kgmid in unique_ids if kgmid not in results]
+        
+        for start in range(0, len(missing), batch_size):
+            batch = missing[start:start + batch_size]
+            try:
+                logger.debug("Fetching %s entities by ID", len(batch))
+                response, data = self._get(self._ids_query(batch), ID_CACHE_EXPIRE)
+                
+                if data is not None:
+                    # Results come back as a flat list - match them to the request by @id ("kg:/m/...")
+                    for item in data.get('itemListElement', []):
+                        entity = item.get('result', {})
+                        entity_id = entity.get('@id', '')
+                        if entity_id.startswith('kg:'):
+                            entity_id = entity_id[3:]
+                        if entity_id in batch and entity_id not in results:
+                            entity_data = self._extract_entity_data(entity)
+                            results[entity_id] = {
+                                'success': True,
+                                'entity': entity_data,
+                                'message': f"Found entity by ID: {entity_data.get('name', 'Unknown')}",
+                                'kg_id': entity_data.get('kg_id', entity_id),
+                                'cached': response.from_cache
+                            }
+                            with self._lock:
+                                self._cache[('id', entity_id)] = dict(results[entity_id])
+                else:
+                    logger.error("Failed to fetch entities by ID: %s", response.status_code)
+                    
+            except Exception as e:
+                logger.error("Error fetching entities by ID: %s", e)
+        
+        # MIDs that came back under a different @id (merged entities) or whose batch call failed
+        # are left out; find_business_entity looks them up itself, inside the batch pool
+        return results
+
     def debug_search_results(self, business_name: str, location: str = None) -> Dict[str, Any]:
         """Debug method to see all search results for troubleshooting"""
         query = business_name
@@ -433,69 +822,50 @@ class KnowledgeGraphAPI:
 
     def debug_kgid_lookup(self, kgmid: str) -> Dict[str, Any]:
         """Debug KG ID lookup with detailed logging"""
-        if DEBUG_MODE:
-            logger.debug(f"🔍 DEBUG: Attempting to fetch KG ID: {kgmid}")
+        logger.debug("🔍 DEBUG: Attempting to fetch KG ID: %s", kgmid)
         
         # Try the direct lookup first
-        params = {
-            'ids': kgmid,
-            'indent': True,
-            'key': self.api_key
-        }
-        
         try:
-            response = self.session.get(self.base_url, params=params, timeout=30)
-            if DEBUG_MODE:
-                logger.debug(f"📡 Direct lookup response status: {response.status_code}")
-                logger.debug(f"📡 Response content: {response.text[:500]}...")
+            response, data = self._get(self._ids_query([kgmid]), ID_CACHE_EXPIRE)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("📡 Direct lookup response status: %s", response.status_code)
+                logger.debug("📡 Response content: %s...", response.text[:500])
             
-            if response.status_code == 200:
-                data = response.json()
-                if DEBUG_MODE:
-                    logger.debug(f"📊 Response data keys: {list(data.keys())}")
+            if data is not None:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("📊 Response data keys: %s", list(data.keys()))
                 entities = data.get('itemListElement', [])
-                if DEBUG_MODE:
-                    logger.debug(f"📊 Found {len(entities)} entities")
+                logger.debug("📊 Found %s entities", len(entities))
                 
                 if entities:
                     entity = entities[0].get('result', {})
-                    if DEBUG_MODE:
-                        logger.debug(f"✅ Entity found: {entity.get('name', 'Unknown')}")
+                    logger.debug("✅ Entity found: %s", entity.get('name', 'Unknown'))
                     return {'success': True, 'entity': entity}
                 else:
-                    logger.warning(f"⚠️ No entities in response for KG ID: {kgmid}")
+                    logger.warning("⚠️ No entities in response for KG ID: %s", kgmid)
             else:
-                logger.error(f"❌ HTTP {response.status_code}: {response.text}")
+                logger.error("❌ HTTP %s: %s", response.status_code, response.text)
                 
         except Exception as e:
-            logger.error(f"💥 Exception during KG ID lookup: {e}")
+            logger.error("💥 Exception during KG ID lookup: %s", e)
         
         return {'success': False, 'error': 'Debug lookup failed'}
 
     def debug_direct_lookup(self, kgmid: str) -> Dict[str, Any]:
         """Debug the direct KG ID lookup"""
-        if DEBUG_MODE:
-            logger.debug(f"🔍 DEBUG: Direct lookup for KG ID: {kgmid}")
-        
-        params = {
-            'ids': kgmid,
-            'indent': True,
-            'key': self.api_key
-        }
+        logger.debug("🔍 DEBUG: Direct lookup for KG ID: %s", kgmid)
         
         try:
-            if DEBUG_MODE:
-                logger.debug(f"📡 Request URL: {self.base_url}")
-                logger.debug(f"📡 Request params: {params}")
+            logger.debug("📡 Request URL: %s", self.base_url)
+            logger.debug("📡 Request params: ids=%s", kgmid)
             
-            response = self.session.get(self.base_url, params=params, timeout=30)
-            if DEBUG_MODE:
-                logger.debug(f"📡 Response status: {response.status_code}")
-                logger.debug(f"📡 Response headers: {dict(response.headers)}")
-                logger.debug(f"📡 Response content: {response.text}")
+            response, data = self._get(self._ids_query([kgmid]), ID_CACHE_EXPIRE)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("📡 Response status: %s", response.status_code)
+                logger.debug("📡 Response headers: %s", dict(response.headers))
+                logger.debug("📡 Response content: %s", response.text)
             
-            if response.status_code == 200:
-                data = response.json()
+            if data is not None:
                 return {
                     'success': True,
                     'raw_response': data,
@@ -509,7 +879,7 @@ class KnowledgeGraphAPI:
                 }
                 
         except Exception as e:
-            logger.error(f"💥 Exception: {e}")
+            logger.error("💥 Exception: %s", e)
             return {'success': False, 'error': str(e)}
 
 def test_knowledge_graph_api():
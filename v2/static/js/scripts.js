@@ -446,12 +446,15 @@ async function fetchData() {
           
           logStatus(`✓ Knowledge Graph entity found: ${enriched.kg_name} (${enriched.kg_id})`);
           
-          // Track Knowledge Graph API usage
-          apiUsageToday++;
-          document.getElementById("apiUsageCount").textContent = apiUsageToday;
-          
-          // Update session counter
-          updateSessionUsage(1, 'kg');
+          // Cached lookups are served by the backend without an API call
+          if (!kgData.cached) {
+            // Track Knowledge Graph API usage
+            apiUsageToday++;
+            document.getElementById("apiUsageCount").textContent = apiUsageToday;
+            
+            // Update session counter
+            updateSessionUsage(1, 'kg');
+          }
           
         } else {
           // Show more detailed information about what was searched
@@ -935,21 +938,43 @@ Last Check: ${new Date().toLocaleTimeString()}`;
     });
 }
 
+// Usage increments are coalesced and sent as one batched request after a short quiet period
+const USAGE_FLUSH_DELAY_MS = 500;
+let pendingUsage = {};
+let usageFlushTimer = null;
+
 function updateSessionUsage(count, apiType = 'unknown') {
+  pendingUsage[apiType] = (pendingUsage[apiType] || 0) + count;
+  clearTimeout(usageFlushTimer);
+  usageFlushTimer = setTimeout(flushSessionUsage, USAGE_FLUSH_DELAY_MS);
+}
+
+function flushSessionUsage() {
+  usageFlushTimer = null;
+  const events = Object.entries(pendingUsage).map(([apiType, count]) => ({
+    api_type: apiType,
+    count: count
+  }));
+  pendingUsage = {};
+  if (events.length === 0) {
+    return;
+  }
+
   fetch('/api/increment-usage', {
     method: 'POST',
     headers: {
       'Content-Type': 'application/json',
     },
-    body: JSON.stringify({
-      count: count,
-      api_type: apiType
-    })
+    body: JSON.stringify({ events: events }),
+    keepalive: true
   }).catch(error => {
     console.log("Failed to sync usage counter:", error);
   });
 }
 
+// Don't lose increments still waiting in the debounce window when the page goes away
+window.addEventListener('pagehide', flushSessionUsage);
+
 async function showDetailedApiUsage() {
   try {
     const response = await fetch('/api/usage-stats');